@@ -9,17 +9,19 @@ Usage:
     python run_pipeline.py deploy             # Only deploy to GitHub Pages
     python run_pipeline.py extract build      # Extract + Build (no deploy)
     python run_pipeline.py --notebook-id ID   # Override notebook ID from config
+    python run_pipeline.py extract --resume   # Skip questions already saved in data/raw/
     python run_pipeline.py --dry-run          # Show plan without executing
 """
 
 import argparse
+import functools
 import io
 import sys
 import json
 from pathlib import Path
 
 # Fix Windows console encoding for Hebrew/emoji output
-if sys.stdout.encoding != "utf-8":
+if sys.platform == "win32" and (sys.stdout.encoding or "").lower() not in ("utf-8", "utf8"):
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
 
@@ -28,8 +30,21 @@ if sys.stdout.encoding != "utf-8":
 ROOT = Path(__file__).parent
 
 
+@functools.lru_cache(maxsize=None)
+def _yaml():
+    """Import pyyaml once, on first use."""
+    import yaml
+    return yaml
+
+
 def load_config(path: Path) -> dict:
     """Load config from YAML or JSON."""
+    # Prefer an up-to-date JSON sibling (e.g. config.json next to config.yaml)
+    if path.suffix != ".json":
+        json_path = path.with_suffix(".json")
+        if json_path.exists() and json_path.stat().st_mtime >= path.stat().st_mtime:
+            path = json_path
+
     text = path.read_text(encoding="utf-8")
 
     # Try JSON first
@@ -38,8 +53,7 @@ def load_config(path: Path) -> dict:
 
     # YAML — try importing pyyaml, fallback to simple parser
     try:
-        import yaml
-        return yaml.safe_load(text)
+        return _yaml().safe_load(text)
     except ImportError:
         print("ERROR: pyyaml not installed. Install with: pip install pyyaml")
         print("  Or convert config.yaml to config.json")
@@ -111,7 +125,7 @@ def run_build(config: dict, dry_run: bool = False) -> bool:
         return True
 
     from src.builder import HTMLBuilder
-    builder = HTMLBuilder(template_path, config)
+    builder = HTMLBuilder(template_path, config, cache_dir=ROOT / ".cache" / "sections")
     size = builder.build(raw_dir, output_path)
 
     print(f"\n  Output: {output_path}")
@@ -147,6 +161,10 @@ def main():
         "--dry-run", action="store_true",
         help="Show what would happen without executing"
     )
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="Skip questions that already have a non-empty answer in data/raw/"
+    )
     parser.add_argument(
         "--config", default="config.yaml",
         help="Config file path (default: config.yaml)"
@@ -167,6 +185,9 @@ def main():
         config["notebook"]["id"] = args.notebook_id
         print(f"  Notebook override: {args.notebook_id}")
 
+    if args.resume:
+        config["query"]["skip_existing"] = True
+
     # Determine phases
     phases = args.phases if args.phases else ["extract", "build", "deploy"]
 
@@ -1,18 +1,42 @@
 """Phase 2b: Convert parsed sections into HTML components and assemble chapters."""
 
+import functools
+import os
 import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from .parser import Section, ContentParser
+from .section_cache import render_cached
 
-RE_PHONE = re.compile(r"(05[0-9]-?\d{3}-?\d{4})")
-RE_BOLD_MARKERS = re.compile(r"\*\*(.+?)\*\*")
+RE_PHONE = re.compile(r"(05[0-9]-?\d{3}-?\d{4})", re.ASCII)
+RE_PLACEHOLDER = re.compile(r"\{\{CHAPTER_(\d+)_CONTENT\}\}")
+RE_COMBINED = re.compile(r"(?P<bold>\*\*(.+?)\*\*)|(?P<phone>05[0-9]-?\d{3}-?\d{4})", re.ASCII)
 
 
+def _phone_link(phone: str) -> str:
+    """Wrap a phone number in a tel: link."""
+    return f'<a href="tel:{phone}">{phone}</a>'
+
+
+def _enhance_repl(m: re.Match) -> str:
+    """Render one RE_COMBINED match as bold text or a phone link."""
+    if m.lastgroup == "bold":
+        # Phones inside bold markers still get linked, as with the old two-pass sub
+        inner = RE_PHONE.sub(lambda p: _phone_link(p.group(1)), m.group(2))
+        return f"<strong>{inner}</strong>"
+    return _phone_link(m.group("phone"))
+
+
+@functools.lru_cache(maxsize=4096)
 def _enhance_text(text: str) -> str:
-    """Add HTML enhancements: bold, phone links."""
-    text = RE_BOLD_MARKERS.sub(r"<strong>\1</strong>", text)
-    text = RE_PHONE.sub(r'<a href="tel:\1">\1</a>', text)
-    return text
+    """Add HTML enhancements: bold, phone links (single regex pass)."""
+    return RE_COMBINED.sub(_enhance_repl, text)
+
+
+def builder_cache_stats():
+    """Return hit/miss statistics for the _enhance_text memo cache."""
+    return _enhance_text.cache_info()
 
 
 class HTMLBuilder:
@@ -25,48 +49,101 @@ class HTMLBuilder:
         "danger":  {"icon": "🛑", "label": "סכנה",       "css": "danger"},
     }
 
-    def __init__(self, template_path: Path, config: dict):
-        self.template = template_path.read_text(encoding="utf-8")
+    def __init__(self, template_path: Path, config: dict, cache_dir: Path | None = None):
+        self.template = template_path.read_bytes().decode("utf-8")
+        # Literal text at even indices, chapter ids (from the capture group) at odd
+        self.template_segments = RE_PLACEHOLDER.split(self.template)
         self.template_dir = template_path.parent
         self.config = config
         self.parser = ContentParser()
+        self.cache_dir = cache_dir or self.template_dir.parent / ".cache" / "sections"
 
     def build(self, raw_dir: Path, output_path: Path):
         """Build the full HTML from chapter files (preferred) or raw answers."""
-        html = self.template
         chapters_dir = self.template_dir / "chapters"
 
-        chapters = self.config["chapters"]
-        for ch in chapters:
-            ch_id = ch["id"]
-
-            print(f"  Building Chapter {ch_id}: {ch['title']}")
+        # Chapter ids in the order the template first asks for them
+        chapters = {ch["id"]: ch for ch in self.config["chapters"]}
+        order = [int(seg) for seg in self.template_segments[1::2]]
+        uses = Counter(order)
+        pending = iter([ch_id for ch_id in dict.fromkeys(order) if ch_id in chapters])
+        workers = max(1, min(8, len(chapters)))
 
-            # Priority 1: Pre-built rich chapter HTML
-            ch_file = chapters_dir / f"ch{ch_id}.html"
-            if ch_file.exists():
-                content = ch_file.read_text(encoding="utf-8")
-                print(f"    Using rich template: {ch_file.name}")
-            else:
-                # Priority 2: Generate from raw data (basic fallback)
-                print(f"    Generating from raw data (fallback)...")
-                content = self._generate_from_raw(ch, raw_dir)
-
-            placeholder = f"{{{{CHAPTER_{ch_id}_CONTENT}}}}"
-            html = html.replace(placeholder, content)
-
-        # Write output
+        remaining = []
+        size = 0
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(html, encoding="utf-8")
+        tmp_path = output_path.with_suffix(output_path.suffix + ".tmp")
+
+        # Chapters are independent, so read/parse them concurrently. Work is
+        # submitted in template order and topped up as each chapter is written,
+        # so at most `workers` chapters are in flight or waiting to be written.
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            futures = {}
+
+            def submit_next():
+                ch_id = next(pending, None)
+                if ch_id is not None:
+                    futures[ch_id] = ex.submit(
+                        self._build_chapter, chapters[ch_id], chapters_dir, raw_dir
+                    )
+
+            for _ in range(workers):
+                submit_next()
+
+            # Content is only kept past its first use if the placeholder repeats
+            repeats = {}
+            try:
+                # Binary mode keeps line endings exactly as read (inputs are read as bytes too)
+                with open(tmp_path, "wb", buffering=1 << 20) as f:
+                    for i, segment in enumerate(self.template_segments):
+                        if i % 2 == 0:
+                            chunk = segment
+                        else:
+                            ch_id = int(segment)
+                            uses[ch_id] -= 1
+                            if ch_id in repeats:
+                                chunk = repeats[ch_id] if uses[ch_id] else repeats.pop(ch_id)
+                            elif ch_id in futures:
+                                _, chunk, log = futures.pop(ch_id).result()
+                                print("\n".join(log))
+                                submit_next()
+                                if uses[ch_id]:
+                                    repeats[ch_id] = chunk
+                            else:
+                                chunk = f"{{{{CHAPTER_{segment}_CONTENT}}}}"
+                                remaining.append(chunk)
+                        f.write(chunk.encode("utf-8"))
+                        size += len(chunk)
+            except BaseException:
+                tmp_path.unlink(missing_ok=True)
+                raise
+
+        os.replace(tmp_path, output_path)
 
-        # Verify no remaining placeholders
-        remaining = re.findall(r"\{\{CHAPTER_\d+_CONTENT\}\}", html)
         if remaining:
             print(f"  WARNING: unfilled placeholders: {remaining}")
 
-        return len(html)
+        return size
+
+    def _build_chapter(self, ch: dict, chapters_dir: Path, raw_dir: Path) -> tuple[int, str, list[str]]:
+        """Build one chapter's content. Returns (chapter id, HTML, log lines)."""
+        # Runs on a worker thread: collect log lines so the caller prints them in order
+        ch_id = ch["id"]
+        log = [f"  Building Chapter {ch_id}: {ch['title']}"]
 
-    def _generate_from_raw(self, ch: dict, raw_dir: Path) -> str:
+        # Priority 1: Pre-built rich chapter HTML
+        ch_file = chapters_dir / f"ch{ch_id}.html"
+        if ch_file.exists():
+            content = ch_file.read_bytes().decode("utf-8")
+            log.append(f"    Using rich template: {ch_file.name}")
+        else:
+            # Priority 2: Generate from raw data (basic fallback)
+            log.append(f"    Generating from raw data (fallback)...")
+            content = self._generate_from_raw(ch, raw_dir, log)
+
+        return ch_id, content, log
+
+    def _generate_from_raw(self, ch: dict, raw_dir: Path, log: list[str]) -> str:
         """Fallback: generate basic HTML from raw answer files."""
         q_ids = ch["questions"]
         parts = []
@@ -74,12 +151,13 @@ class HTMLBuilder:
         for q_id in q_ids:
             raw_file = raw_dir / f"{q_id}.txt"
             if raw_file.exists():
-                raw_text = raw_file.read_text(encoding="utf-8")
-                sections = self.parser.parse(raw_text)
-                chapter_html = self._sections_to_html(sections)
+                raw_text = raw_file.read_bytes().decode("utf-8")
+                chapter_html = render_cached(
+                    raw_text, self, self.parser, cache_dir=self.cache_dir
+                )
                 parts.append(chapter_html)
             else:
-                print(f"    Missing: {raw_file.name}")
+                log.append(f"    Missing: {raw_file.name}")
 
         return "\n<hr class='chapter-divider'>\n".join(parts) if parts else "<p>תוכן בקרוב...</p>"
 
@@ -100,18 +178,17 @@ class HTMLBuilder:
 
     def _build_list(self, items: list) -> str:
         """Build <ul> with optional nested sub-lists."""
-        html = "<ul>\n"
+        parts = ["<ul>"]
         for item in items:
             if isinstance(item, tuple):
                 text, subs = item
-                html += f"<li>{_enhance_text(text)}\n<ul>\n"
-                for sub in subs:
-                    html += f"<li>{_enhance_text(sub)}</li>\n"
-                html += "</ul>\n</li>\n"
+                parts.extend([f"<li>{_enhance_text(text)}", "<ul>"])
+                parts.extend(f"<li>{_enhance_text(sub)}</li>" for sub in subs)
+                parts.extend(["</ul>", "</li>"])
             else:
-                html += f"<li>{_enhance_text(item)}</li>\n"
-        html += "</ul>"
-        return html
+                parts.append(f"<li>{_enhance_text(item)}</li>")
+        parts.append("</ul>")
+        return "\n".join(parts)
 
     def _build_tip_box(self, content: str, variant: str) -> str:
         """Build a tip-box div."""
@@ -1,8 +1,12 @@
 """Phase 3: Deploy to GitHub Pages via git + gh CLI."""
 
+import hashlib
 import subprocess
+import time
 from pathlib import Path
 
+GH_USER_TTL = 30 * 24 * 60 * 60  # seconds
+
 
 class GitHubDeployer:
     """Initialize git, create GitHub repo, push, and enable Pages."""
@@ -13,11 +17,12 @@ class GitHubDeployer:
     def deploy(self, dry_run: bool = False) -> bool:
         """Full deploy pipeline: git init → repo create → push → enable Pages."""
         # Pre-flight checks
-        if not self._check_tool("git --version", "git"):
+        if self._check_tool(["git", "--version"], "git") is None:
             return False
-        if not self._check_tool("gh --version", "gh CLI"):
+        if self._check_tool(["gh", "--version"], "gh CLI") is None:
             return False
-        if not self._check_tool("gh auth status", "gh auth"):
+        auth_status = self._check_tool(["gh", "auth", "status"], "gh auth")
+        if auth_status is None:
             return False
 
         dist_file = self.root / "docs" / "index.html"
@@ -37,10 +42,10 @@ class GitHubDeployer:
         git_dir = self.root / ".git"
         if not git_dir.exists():
             print("  Initializing git repository...")
-            if not self._run("git init"):
+            if not self._run(["git", "init"]):
                 return False
             # Ensure main branch
-            self._run("git branch -M main")
+            self._run(["git", "branch", "-M", "main"])
 
         # Step 2: Stage and commit
         print("  Staging files...")
@@ -48,39 +53,41 @@ class GitHubDeployer:
             "docs/", "templates/", "src/", "config.yaml",
             "run_pipeline.py", ".gitignore"
         ]
-        for f in files_to_add:
-            path = self.root / f.rstrip("/")
-            if path.exists():
-                self._run(f"git add {f}")
+        existing = [f for f in files_to_add if (self.root / f.rstrip("/")).exists()]
+        if existing:
+            if not self._run(["git", "add", "--", *existing]):
+                return False
 
-        # Check if there are changes to commit
-        result = subprocess.run(
-            "git diff --cached --quiet",
-            shell=True, cwd=self.root
-        )
-        if result.returncode == 0:
-            print("  No changes to commit.")
-        else:
-            print("  Committing...")
-            if not self._run('git commit -m "Update course content"'):
+            # Let git commit decide whether anything changed: it exits non-zero
+            # with nothing on stderr when there is nothing to commit
+            result = subprocess.run(
+                ["git", "commit", "-m", "Update course content", "--", *existing],
+                cwd=self.root, capture_output=True, text=True
+            )
+            if result.returncode == 0:
+                print("  Committed changes.")
+            elif not result.stderr.strip():
+                print("  No changes to commit.")
+            else:
+                print(f"    Error: {result.stderr.strip()[:200]}")
                 return False
 
         # Step 3: Check/create remote
-        has_remote = self._run_quiet("git remote get-url origin")
+        has_remote = self._run_quiet(["git", "remote", "get-url", "origin"])
 
         if not has_remote:
             repo_name = self.root.name
             print(f"  Creating GitHub repo: {repo_name}...")
-            if not self._run(f"gh repo create {repo_name} --public --source=. --push"):
+            if not self._run(["gh", "repo", "create", repo_name, "--public", "--source=.", "--push"]):
                 return False
         else:
             print("  Pushing to existing remote...")
-            if not self._run("git push origin main"):
+            if not self._run(["git", "push", "origin", "main"]):
                 # Try setting upstream
-                self._run("git push -u origin main")
+                self._run(["git", "push", "-u", "origin", "main"])
 
         # Step 4: Enable GitHub Pages
-        owner = self._get_output("gh api user --jq .login")
+        owner = self._get_username(auth_status)
         if owner:
             repo_name = self.root.name
             full_name = f"{owner}/{repo_name}"
@@ -88,10 +95,12 @@ class GitHubDeployer:
 
             # Try to enable pages — may already be enabled
             self._run(
-                f'gh api repos/{full_name}/pages -X POST '
-                f'-f build_type=legacy '
-                f"-f source[branch]=main "
-                f"-f source[path]=/docs",
+                [
+                    "gh", "api", f"repos/{full_name}/pages", "-X", "POST",
+                    "-f", "build_type=legacy",
+                    "-f", "source[branch]=main",
+                    "-f", "source[path]=/docs",
+                ],
                 silent=True
             )
 
@@ -102,10 +111,27 @@ class GitHubDeployer:
 
         return True
 
-    def _run(self, cmd: str, silent: bool = False) -> bool:
-        """Run a shell command and return success."""
+    def _get_username(self, auth_status: str) -> str | None:
+        """Return the GitHub login, cached in .cache/gh_user to skip the API call."""
+        # Key the cache on the `gh auth status` output so switching accounts invalidates it
+        signature = hashlib.sha256(auth_status.encode("utf-8")).hexdigest()[:16]
+        cache = self.root / ".cache" / "gh_user"
+        if cache.exists() and time.time() - cache.stat().st_mtime < GH_USER_TTL:
+            cached_signature, _, owner = cache.read_text(encoding="utf-8").partition("\n")
+            owner = owner.strip()
+            if cached_signature == signature and owner:
+                return owner
+
+        owner = self._get_output(["gh", "api", "user", "--jq", ".login"])
+        if owner:
+            cache.parent.mkdir(parents=True, exist_ok=True)
+            cache.write_text(f"{signature}\n{owner}", encoding="utf-8")
+        return owner
+
+    def _run(self, args: list[str], silent: bool = False) -> bool:
+        """Run a command and return success."""
         result = subprocess.run(
-            cmd, shell=True, cwd=self.root,
+            args, cwd=self.root,
             capture_output=True, text=True
         )
         if result.returncode != 0 and not silent:
@@ -114,30 +140,33 @@ class GitHubDeployer:
                 print(f"    Error: {stderr[:200]}")
         return result.returncode == 0
 
-    def _run_quiet(self, cmd: str) -> bool:
+    def _run_quiet(self, args: list[str]) -> bool:
         """Run command silently, return success."""
         result = subprocess.run(
-            cmd, shell=True, cwd=self.root,
+            args, cwd=self.root,
             capture_output=True, text=True
         )
         return result.returncode == 0
 
-    def _get_output(self, cmd: str) -> str | None:
+    def _get_output(self, args: list[str]) -> str | None:
         """Run command and return stdout."""
         result = subprocess.run(
-            cmd, shell=True, cwd=self.root,
+            args, cwd=self.root,
             capture_output=True, text=True
         )
         if result.returncode == 0:
             return result.stdout.strip()
         return None
 
-    def _check_tool(self, cmd: str, name: str) -> bool:
-        """Check if a CLI tool is available."""
-        result = subprocess.run(
-            cmd, shell=True, capture_output=True, text=True
-        )
+    def _check_tool(self, args: list[str], name: str) -> str | None:
+        """Check if a CLI tool is available. Returns its output, or None if unavailable."""
+        try:
+            result = subprocess.run(args, capture_output=True, text=True)
+        except FileNotFoundError:
+            print(f"  {name} not available. Install it first.")
+            return None
         if result.returncode != 0:
             print(f"  {name} not available. Install it first.")
-            return False
-        return True
+            return None
+        # Some gh versions report auth status on stderr
+        return result.stdout + result.stderr
@@ -1,9 +1,21 @@
 """Phase 1: Extract answers from NotebookLM via browser automation skill."""
 
-import subprocess
-import time
+import asyncio
+import json
+import os
+import random
 import re
+import tempfile
 from pathlib import Path
+from .rate_limiter import TokenBucket
+
+RE_DIVIDER = re.compile(r"={10,}")
+RE_GOT_ANSWER = re.compile(r"Got answer!\s*\n(.*)", re.DOTALL)
+RE_TRAILING_DIVIDER = re.compile(r"\n={10,}\s*$")
+
+
+class SkillError(Exception):
+    """The NotebookLM skill subprocess timed out, crashed, or exited non-zero."""
 
 
 class NotebookExtractor:
@@ -12,83 +24,188 @@ class NotebookExtractor:
     def __init__(self, config: dict):
         self.notebook_id = config["notebook"]["id"]
         self.skill_path = Path(config["notebook"]["skill_path"])
-        self.delay = config["query"]["delay_seconds"]
+        # Fall back to the old fixed delay when no explicit rate is configured;
+        # a missing or non-positive rate/delay means unthrottled
+        rpm = config["query"].get("rpm")
+        if rpm is None:
+            delay = config["query"].get("delay_seconds", 0)
+            rpm = 60 / delay if delay > 0 else None
+        self.bucket = TokenBucket(rpm, burst=config["query"].get("burst", 1))
+        self.max_concurrency = max(1, config["query"].get("max_concurrency", 1))
+        self.batch_size = max(1, config["query"].get("batch_size", 1))
+        self.skip_existing = config["query"].get("skip_existing", False)
         self.retries = config["query"]["retry_attempts"]
         self.timeout = config["query"]["timeout_seconds"]
         self.strip_marker = config["query"]["strip_suffix"]
 
     def extract_all(self, questions: list, output_dir: Path) -> dict:
         """Run all questions and save answers. Returns {q_id: {success, file, chars}}."""
+        return asyncio.run(self.extract_all_async(questions, output_dir))
+
+    async def extract_all_async(self, questions: list, output_dir: Path) -> dict:
+        """Run question batches concurrently, at most `max_concurrency` in flight at once."""
         results = {}
-        total = len(questions)
-
-        for i, q in enumerate(questions, 1):
-            q_id = q["id"]
-            text = q["text"]
-            print(f"\n  [{i}/{total}] {q_id}: {text[:70]}...")
-
-            answer = self._query(text)
-
-            if answer is None and self.retries > 0:
-                print(f"    Retrying...")
-                time.sleep(5)
-                answer = self._query(text)
-
-            if answer:
-                answer = self._clean_answer(answer)
-                out_file = output_dir / f"{q_id}.txt"
-                out_file.write_text(answer, encoding="utf-8")
-                print(f"    Saved {out_file.name} ({len(answer)} chars)")
-                results[q_id] = {"success": True, "file": out_file, "chars": len(answer)}
+        if self.skip_existing:
+            pending = []
+            for q in questions:
+                out_file = output_dir / f"{q['id']}.txt"
+                if out_file.exists() and out_file.stat().st_size > 0:
+                    chars = len(out_file.read_bytes().decode("utf-8"))
+                    print(f"  {q['id']}: already extracted ({chars} chars) - skipping")
+                    results[q["id"]] = {"success": True, "file": out_file, "chars": chars}
+                else:
+                    pending.append(q)
+            questions = pending
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        batches = [
+            questions[i:i + self.batch_size]
+            for i in range(0, len(questions), self.batch_size)
+        ]
+        total = len(batches)
+
+        async def bounded(i: int, batch: list) -> dict:
+            async with semaphore:
+                return await self._extract_batch(batch, output_dir, f"[{i}/{total}]")
+
+        tasks = [bounded(i, batch) for i, batch in enumerate(batches, 1)]
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+
+        for batch, outcome in zip(batches, outcomes):
+            if isinstance(outcome, BaseException):
+                for q in batch:
+                    print(f"    {q['id']}: Exception: {outcome}")
+                    results[q["id"]] = {"success": False}
             else:
-                print(f"    FAILED - skipping")
-                results[q_id] = {"success": False}
+                results.update(outcome)
+        return results
 
-            if i < total:
-                print(f"    Waiting {self.delay}s...")
-                time.sleep(self.delay)
+    async def _extract_batch(self, batch: list, output_dir: Path, progress: str) -> dict:
+        """Query a batch in one subprocess, falling back to single queries for misses."""
+        if len(batch) == 1:
+            q = batch[0]
+            return {q["id"]: await self._extract_one(q, output_dir, progress)}
 
+        print(f"\n  {progress} Batch: {', '.join(q['id'] for q in batch)}")
+        answers = await self._query_batch_async([q["text"] for q in batch])
+        if answers is None:
+            answers = {}
+
+        results = {}
+        for q in batch:
+            answer = answers.get(q["text"])
+            # Anything but a non-empty string is a miss and goes to the fallback
+            if isinstance(answer, str) and answer:
+                results[q["id"]] = self._save_answer(q["id"], answer, output_dir)
+            else:
+                results[q["id"]] = await self._extract_one(q, output_dir, f"{progress} (fallback)")
         return results
 
-    def _query(self, question: str) -> str | None:
-        """Run a single NotebookLM query via subprocess."""
-        # Escape double quotes in question
-        escaped_q = question.replace('"', '\\"')
+    async def _extract_one(self, q: dict, output_dir: Path, progress: str) -> dict:
+        """Query a single question (with retry) and save its answer."""
+        q_id = q["id"]
+        text = q["text"]
+        print(f"\n  {progress} {q_id}: {text[:70]}...")
+
+        answer = None
+        attempts = self.retries + 1
+        for attempt in range(attempts):
+            try:
+                answer = await self._query_once(text)
+                break  # A parse miss won't improve on retry
+            except SkillError as e:
+                print(f"    {q_id}: attempt {attempt + 1}/{attempts} failed: {e}")
+                if attempt + 1 < attempts:
+                    backoff = min(60, 2 ** attempt) + random.random()
+                    print(f"    {q_id}: Retrying in {backoff:.1f}s...")
+                    await asyncio.sleep(backoff)
+
+        if answer:
+            return self._save_answer(q_id, answer, output_dir)
+
+        print(f"    {q_id}: FAILED - skipping")
+        return {"success": False}
+
+    def _save_answer(self, q_id: str, answer: str, output_dir: Path) -> dict:
+        """Clean an answer and write it to <q_id>.txt."""
+        answer = self._clean_answer(answer)
+        out_file = output_dir / f"{q_id}.txt"
+        out_file.write_bytes(answer.encode("utf-8"))
+        print(f"    Saved {out_file.name} ({len(answer)} chars)")
+        return {"success": True, "file": out_file, "chars": len(answer)}
+
+    async def _query_once(self, question: str) -> str | None:
+        """Run a single NotebookLM query. Raises SkillError if the run itself failed."""
+        stdout = await self._run_skill(["--question", question], self.timeout)
+        return self._extract_answer(stdout)
+
+    async def _query_batch_async(self, questions: list[str]) -> dict[str, str | None] | None:
+        """Ask several questions in one skill run. Returns {question: answer}, or None."""
+        fd, batch_path = tempfile.mkstemp(prefix="batch_", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(questions, f, ensure_ascii=False)
+            stdout = await self._run_skill(
+                ["--batch", batch_path], self.timeout * len(questions)
+            )
+        except SkillError as e:
+            print(f"    Batch failed: {e}")
+            return None
+        finally:
+            os.unlink(batch_path)
+
+        try:
+            answers = json.loads(stdout)
+        except json.JSONDecodeError:
+            print(f"    Batch output was not valid JSON - falling back to single queries")
+            return None
+        if not isinstance(answers, dict):
+            print(f"    Batch output was not a JSON object - falling back to single queries")
+            return None
+        return answers
+
+    async def _run_skill(self, args: list[str], timeout: float) -> str:
+        """Run ask_question.py with the given arguments and return its stdout."""
+        await self.bucket.acquire()
 
-        cmd = (
-            f'cmd /c "cd /d "{self.skill_path}" && '
-            f"set PYTHONIOENCODING=utf-8 && "
-            f'.venv\\Scripts\\python.exe scripts\\run.py ask_question.py '
-            f'--question "{escaped_q}" '
-            f'--notebook-id "{self.notebook_id}""'
-        )
+        # Exec the skill's venv python directly (no cmd.exe middleman, no quoting)
+        argv = [
+            str(self.skill_path / ".venv" / "Scripts" / "python.exe"),
+            str(Path("scripts") / "run.py"), "ask_question.py",
+            *args,
+            "--notebook-id", self.notebook_id,
+        ]
+        env = {**os.environ, "PYTHONIOENCODING": "utf-8"}
 
         try:
-            result = subprocess.run(
-                cmd, shell=True, capture_output=True, text=True,
-                timeout=self.timeout, encoding="utf-8"
+            proc = await asyncio.create_subprocess_exec(
+                *argv, cwd=str(self.skill_path), env=env,
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
             )
-            if result.returncode == 0:
-                return self._extract_answer(result.stdout)
-            else:
-                print(f"    Error: {result.stderr[:200]}")
-                return None
-        except subprocess.TimeoutExpired:
-            print(f"    Timeout ({self.timeout}s)")
-            return None
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                raise SkillError(f"Timeout ({timeout}s)")
+        except SkillError:
+            raise
         except Exception as e:
-            print(f"    Exception: {e}")
-            return None
+            raise SkillError(f"Exception: {e}") from e
+
+        if proc.returncode != 0:
+            raise SkillError(f"Error: {stderr.decode('utf-8', errors='replace')[:200]}")
+        return stdout.decode("utf-8", errors="replace")
 
     def _extract_answer(self, output: str) -> str | None:
         """Extract the answer text between the two === dividers."""
-        # Split on ========== lines
-        parts = re.split(r"={10,}", output)
+        # Split on ========== lines; only the first three parts are ever used
+        parts = RE_DIVIDER.split(output, maxsplit=3)
         # The answer is in the 3rd part (after header, after Question line)
         if len(parts) >= 3:
             return parts[2].strip()
         # Fallback: try to find content after "Got answer!"
-        match = re.search(r"Got answer!\s*\n(.*)", output, re.DOTALL)
+        match = RE_GOT_ANSWER.search(output)
         if match:
             return match.group(1).strip()
         return None
@@ -99,5 +216,5 @@ class NotebookExtractor:
         if idx != -1:
             text = text[:idx].strip()
         # Also remove trailing === dividers
-        text = re.sub(r"\n={10,}\s*$", "", text)
+        text = RE_TRAILING_DIVIDER.sub("", text)
         return text
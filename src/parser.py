@@ -17,12 +17,15 @@ class ContentParser:
     """Parse NotebookLM markdown-style text into structured sections."""
 
     # Regex patterns matching NotebookLM output format
-    RE_NUMBERED_HEADER = re.compile(r"^\d+\.\s+(.+?)[\s]*$")
+    # Digits are spelled [0-9] (ASCII only) while \s stays Unicode-aware for NBSPs
+    RE_NUMBERED_HEADER = re.compile(r"^[0-9]+\.\s+(.+?)[\s]*$")
     RE_BULLET = re.compile(r"^[•●]\s+(.+)$")
     RE_SUB_BULLET = re.compile(r"^\s+[◦○]\s+(.+)$")
     RE_PHONE = re.compile(r"(05[0-9]-?\d{3}-?\d{4})")
     RE_BOLD = re.compile(r"\*\*(.+?)\*\*")
-    RE_FOOTNOTE = re.compile(r"\d{1,2}(?:,\d{1,2})*\.?(?:\.\.\.\.|\.{0,3})(?=\s|$|[,)])")
+    # Leading \s* drops the space before a marker along with the marker itself
+    RE_FOOTNOTE = re.compile(r"\s*[0-9]{1,2}(?:,[0-9]{1,2})*\.?(?:\.\.\.\.|\.{0,3})(?=\s|$|[,)])")
+    RE_EMOJI = re.compile(r"[\U0001F001-\U0010FFFF]")
 
     # Tip box triggers (Hebrew)
     TIP_TRIGGERS = {
@@ -31,6 +34,12 @@ class ContentParser:
         "danger": ["סכנה", "סכנת חיים", "חוק ברזל"],
         "info": ["הערה", "חשוב", "מידע"],
     }
+    # One named group per variant, in TIP_TRIGGERS order, so the first
+    # matching variant wins just like a sequential startswith scan
+    RE_TIP = re.compile("|".join(
+        f"(?P<{variant}>(?:{'|'.join(re.escape(t) for t in triggers)})[: ])"
+        for variant, triggers in TIP_TRIGGERS.items()
+    ))
 
     def parse(self, raw_text: str) -> list[Section]:
         """Parse raw answer text into a list of Sections."""
@@ -124,18 +133,12 @@ class ContentParser:
 
     def _detect_tip_type(self, text: str) -> str | None:
         """Check if line starts with a tip box trigger word."""
-        for variant, triggers in self.TIP_TRIGGERS.items():
-            for trigger in triggers:
-                if text.startswith(trigger + ":") or text.startswith(trigger + " "):
-                    return variant
-        return None
+        m = self.RE_TIP.match(text)
+        return m.lastgroup if m else None
 
     def _has_emoji(self, text: str) -> bool:
         """Check if text contains emoji characters."""
-        for ch in text:
-            if ord(ch) > 0x1F000:
-                return True
-        return False
+        return self.RE_EMOJI.search(text) is not None
 
     def _clean_text(self, text: str) -> str:
         """Clean footnote markers from text."""
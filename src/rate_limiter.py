@@ -0,0 +1,31 @@
+"""Client-side token-bucket throttle for NotebookLM queries."""
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Allow `rate_per_min` acquisitions per minute, with up to `burst` back-to-back.
+
+    A `rate_per_min` of None or <= 0 disables throttling.
+    """
+
+    def __init__(self, rate_per_min: float | None, burst: int = 1):
+        self.interval = 60.0 / rate_per_min if rate_per_min and rate_per_min > 0 else 0.0
+        self.burst = max(1, burst)
+        self._next_time = time.monotonic()
+
+    def _reserve(self) -> float:
+        """Claim the next slot and return how long to wait for it."""
+        now = time.monotonic()
+        self._next_time = max(self._next_time, now)
+        wait = self._next_time - (self.burst - 1) * self.interval - now
+        self._next_time += self.interval
+        return max(0.0, wait)
+
+    async def acquire(self):
+        """Wait until a token is available."""
+        if not self.interval:
+            return
+        # _reserve has no await, so the check-and-advance is atomic on the event loop
+        await asyncio.sleep(self._reserve())
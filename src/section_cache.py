@@ -0,0 +1,27 @@
+"""Content-hash cache for raw answers rendered to HTML sections."""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+
+# Bump whenever ContentParser or HTMLBuilder output changes
+PARSER_VERSION = "3"
+
+
+def render_cached(raw_text: str, builder, parser, *, cache_dir: Path) -> str:
+    """Return HTML for raw_text, parsing and rendering only on a cache miss."""
+    key = hashlib.sha256(raw_text.encode("utf-8") + PARSER_VERSION.encode("utf-8")).hexdigest()[:16]
+    cache_file = cache_dir / f"{key}.html"
+    if cache_file.exists():
+        return cache_file.read_bytes().decode("utf-8")
+
+    sections = parser.parse(raw_text)
+    html = builder._sections_to_html(sections)
+
+    # Write atomically so a concurrent or interrupted build never sees a partial file
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_file = cache_file.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+    tmp_file.write_bytes(html.encode("utf-8"))
+    os.replace(tmp_file, cache_file)
+    return html